@@ -1,9 +1,36 @@
 from flask import Flask, request, jsonify
 from flask_cors import CORS
 from flask_socketio import SocketIO
+import json
+import os
 import re
 from urllib.parse import urlparse
 
+# Optional C-accelerated JSON for Socket.IO packet encoding: every
+# new_detection / stats_update broadcast goes through this codec
+try:
+    import orjson
+
+    class _OrjsonPackets:
+        """json-module shim for python-socketio's packet codec.
+
+        orjson returns bytes and takes no formatting kwargs, so adapt it
+        to the dumps(obj, **kw) -> str / loads(s) interface the engine
+        expects.
+        """
+
+        @staticmethod
+        def dumps(obj, **kwargs):
+            return orjson.dumps(obj).decode()
+
+        @staticmethod
+        def loads(s, **kwargs):
+            return orjson.loads(s)
+
+    _SOCKETIO_JSON = _OrjsonPackets
+except ImportError:
+    _SOCKETIO_JSON = json
+
 from fuzzer import analyze_domain_advanced
 from watchtower_api import watchtower_bp, init_watchtower_api
 from scanner_api import scanner_bp
@@ -11,8 +38,17 @@ from scanner_api import scanner_bp
 app = Flask(__name__)
 CORS(app, resources={r"/*": {"origins": "*"}})
 
-# Initialize SocketIO with CORS support
-socketio = SocketIO(app, cors_allowed_origins="*", async_mode='threading')
+# Async mode for SocketIO. Every endpoint is I/O-bound (DNS, headless
+# browser, CT stream), so under gunicorn we run gevent workers where each
+# in-flight scan costs a greenlet instead of an OS thread. Default stays
+# 'threading' for the dev server; the Docker image sets SOCKETIO_ASYNC_MODE.
+ASYNC_MODE = os.environ.get('SOCKETIO_ASYNC_MODE', 'threading')
+
+# Initialize SocketIO with CORS support. Under `gunicorn -k gevent` the
+# worker monkey-patches the stdlib before loading the app, so blocking DNS
+# and HTTP calls cooperatively yield without further changes here.
+socketio = SocketIO(app, cors_allowed_origins="*", async_mode=ASYNC_MODE,
+                    json=_SOCKETIO_JSON)
 
 # Register blueprints
 app.register_blueprint(watchtower_bp)
@@ -5,8 +5,11 @@ SCANNER API - Domain Vulnerability Scanner
 REST API for on-demand domain scanning with DNSTwist-style fuzzing.
 """
 
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, Response, stream_with_context
 from typing import List, Dict, Optional
+import json
+import re
+import sys
 import logging
 import time
 import socket
@@ -21,19 +24,61 @@ try:
 except ImportError:
     HAS_DNSTWIST = False
 
+# Try to import orjson for faster serialization on streaming endpoints
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+
+def _json_line(obj: Dict) -> bytes:
+    """Serialize one object as an NDJSON line."""
+    if HAS_ORJSON:
+        return orjson.dumps(obj) + b'\n'
+    return (json.dumps(obj) + '\n').encode('utf-8')
+
 logger = logging.getLogger('SCANNER')
 
 # Create Blueprint
 scanner_bp = Blueprint('scanner', __name__, url_prefix='/api/scanner')
 
+# Thai brands checked by /quick-check and /analyze-single
+THAI_TARGETS = ['kbank', 'scb', 'kasikorn', 'bangkok', 'krungsri', 'ttb', 'gsb',
+                'lazada', 'shopee', 'line']
+
+# One compiled alternation scans the domain in a single pass instead of
+# N Python-level substring checks per request
+_THAI_RE = re.compile('(' + '|'.join(THAI_TARGETS) + ')')
+
+# Known-legitimate domains per target, precomputed once instead of
+# rebuilding 5 f-strings per target on every quick-check request
+_LEGIT_BY_TARGET = {
+    target: frozenset([
+        f'{target}.com', f'{target}.co.th', f'{target}.th',
+        f'www.{target}.com', f'www.{target}.co.th'
+    ])
+    for target in THAI_TARGETS
+}
+
 
 # ============================================================================
 # DOMAIN FUZZER (Fallback if dnstwist not available)
 # ============================================================================
 
+# Fuzzer-type labels come from a tiny closed vocabulary but end up duplicated
+# in every result dict of every scan; intern them so all results share one
+# str object per label (less heap, pointer-fast dict comparisons downstream).
+_FUZZER_LABELS = {
+    name: sys.intern(name)
+    for name in ('original', 'homoglyph', 'omission', 'repetition',
+                 'addition', 'tld-swap', 'hyphenation')
+}
+
+
 class SimpleFuzzer:
     """Simplified domain fuzzer for demo purposes."""
-    
+
     COMMON_TLDS = ['.com', '.net', '.org', '.xyz', '.io', '.co', '.app', '.site', '.online', '.info']
     
     def __init__(self, domain: str):
@@ -47,42 +92,42 @@ class SimpleFuzzer:
         results = []
         
         # Original
-        results.append({'domain': self.domain, 'fuzzer': 'original'})
+        results.append({'domain': self.domain, 'fuzzer': _FUZZER_LABELS['original']})
         
         # Homoglyphs
         homoglyphs = {'a': '4', 'e': '3', 'i': '1', 'o': '0', 's': '5', 'l': '1'}
         for char, replacement in homoglyphs.items():
             if char in self.name:
                 fuzzy = self.name.replace(char, replacement, 1)
-                results.append({'domain': f"{fuzzy}{self.tld}", 'fuzzer': 'homoglyph'})
+                results.append({'domain': f"{fuzzy}{self.tld}", 'fuzzer': _FUZZER_LABELS['homoglyph']})
         
         # Typos - omission
         for i in range(len(self.name)):
             fuzzy = self.name[:i] + self.name[i+1:]
             if fuzzy:
-                results.append({'domain': f"{fuzzy}{self.tld}", 'fuzzer': 'omission'})
+                results.append({'domain': f"{fuzzy}{self.tld}", 'fuzzer': _FUZZER_LABELS['omission']})
         
         # Typos - repetition
         for i in range(len(self.name)):
             fuzzy = self.name[:i] + self.name[i] + self.name[i:]
-            results.append({'domain': f"{fuzzy}{self.tld}", 'fuzzer': 'repetition'})
+            results.append({'domain': f"{fuzzy}{self.tld}", 'fuzzer': _FUZZER_LABELS['repetition']})
         
         # Addition
         additions = ['-secure', '-login', '-official', '-thailand', '-verify', 'secure-', 'login-', 'official-']
         for add in additions:
             if add.startswith('-'):
-                results.append({'domain': f"{self.name}{add}{self.tld}", 'fuzzer': 'addition'})
+                results.append({'domain': f"{self.name}{add}{self.tld}", 'fuzzer': _FUZZER_LABELS['addition']})
             else:
-                results.append({'domain': f"{add}{self.name}{self.tld}", 'fuzzer': 'addition'})
+                results.append({'domain': f"{add}{self.name}{self.tld}", 'fuzzer': _FUZZER_LABELS['addition']})
         
         # TLD swap
         for tld in self.COMMON_TLDS:
             if tld != self.tld:
-                results.append({'domain': f"{self.name}{tld}", 'fuzzer': 'tld-swap'})
+                results.append({'domain': f"{self.name}{tld}", 'fuzzer': _FUZZER_LABELS['tld-swap']})
         
         # Hyphenation
         if '-' not in self.name and len(self.name) > 3:
-            results.append({'domain': f"{self.name[:len(self.name)//2]}-{self.name[len(self.name)//2:]}{self.tld}", 'fuzzer': 'hyphenation'})
+            results.append({'domain': f"{self.name[:len(self.name)//2]}-{self.name[len(self.name)//2:]}{self.tld}", 'fuzzer': _FUZZER_LABELS['hyphenation']})
         
         # Remove duplicates
         seen = set()
@@ -103,22 +148,26 @@ def resolve_domain(domain: str, timeout: float = 2.0) -> Dict:
     """Resolve a domain and return DNS records."""
     result = {
         'domain': domain,
-        'dns_a': [],
-        'dns_mx': [],
+        'dns_a': (),
+        'dns_mx': (),
         'is_registered': False
     }
     
+    socket.setdefaulttimeout(timeout)
     try:
         # A records
-        socket.setdefaulttimeout(timeout)
         ips = socket.gethostbyname_ex(domain)[2]
-        result['dns_a'] = ips
-        result['is_registered'] = True
-    except (socket.gaierror, socket.timeout):
-        pass
-    except Exception:
-        pass
-    
+    except socket.gaierror:
+        # NXDOMAIN/NODATA - the common case for unregistered permutations;
+        # return immediately with no further work
+        return result
+    except OSError:
+        # Timeouts and transient resolver failures
+        return result
+
+    # Tuple instead of list: immutable, smaller, and hashable for dedup
+    result['dns_a'] = tuple(ips)
+    result['is_registered'] = True
     return result
 
 
@@ -242,6 +291,80 @@ def scan_domain():
     })
 
 
+@scanner_bp.route('/scan/stream', methods=['POST'])
+def scan_domain_stream():
+    """
+    Scan a domain and stream results as NDJSON (one object per permutation).
+
+    Unlike /scan, the client sees each result as soon as its DNS resolution
+    completes instead of waiting for the slowest lookup. A final summary
+    object (with "summary": true) closes the stream.
+    """
+    data = request.json
+    if not data or 'domain' not in data:
+        return jsonify({'error': 'Domain is required'}), 400
+
+    target_domain = data['domain'].strip().lower()
+    if not target_domain:
+        return jsonify({'error': 'Invalid domain'}), 400
+
+    # Remove protocol if present
+    if '://' in target_domain:
+        target_domain = target_domain.split('://')[1]
+    target_domain = target_domain.split('/')[0]
+
+    # Generate permutations up front so the total is known
+    fuzzer = SimpleFuzzer(target_domain)
+    permutations = fuzzer.generate()
+
+    def generate():
+        start_time = time.time()
+        registered_count = 0
+        high_risk_count = 0
+
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=20)
+        try:
+            futures = {executor.submit(resolve_domain, p['domain']): p for p in permutations}
+
+            for future in concurrent.futures.as_completed(futures, timeout=30):
+                perm = futures[future]
+                try:
+                    dns_result = future.result()
+                    result = {**dns_result, 'fuzzer': perm['fuzzer']}
+                    result = calculate_risk(result, target_domain)
+                except Exception as e:
+                    logger.error(f"Error resolving {perm['domain']}: {e}")
+                    result = {
+                        'domain': perm['domain'],
+                        'fuzzer': perm['fuzzer'],
+                        'dns_a': [],
+                        'dns_mx': [],
+                        'is_registered': False,
+                        'risk_score': 0,
+                        'risk_factors': []
+                    }
+
+                if result['is_registered']:
+                    registered_count += 1
+                if result['risk_score'] >= 70:
+                    high_risk_count += 1
+
+                yield _json_line(result)
+
+            yield _json_line({
+                'summary': True,
+                'target': target_domain,
+                'total_permutations': len(permutations),
+                'registered_count': registered_count,
+                'high_risk_count': high_risk_count,
+                'scan_time': round(time.time() - start_time, 2)
+            })
+        finally:
+            executor.shutdown(wait=False)
+
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+
 @scanner_bp.route('/permutations', methods=['POST'])
 def get_permutations():
     """Get domain permutations without DNS resolution."""
@@ -268,24 +391,18 @@ def quick_check():
         return jsonify({'error': 'Domain is required'}), 400
     
     domain = data['domain'].strip().lower()
-    
-    # Check against Thai targets
-    thai_targets = ['kbank', 'scb', 'kasikorn', 'bangkok', 'krungsri', 'ttb', 'gsb', 'lazada', 'shopee', 'line']
-    
+
     is_suspicious = False
     matched_target = None
-    
-    for target in thai_targets:
-        if target in domain:
-            # Check if it's not the legitimate domain
-            legit_domains = [
-                f'{target}.com', f'{target}.co.th', f'{target}.th',
-                f'www.{target}.com', f'www.{target}.co.th'
-            ]
-            if domain not in legit_domains:
-                is_suspicious = True
-                matched_target = target
-                break
+
+    # Check against Thai targets in one regex pass
+    for m in _THAI_RE.finditer(domain):
+        target = m.group(1)
+        # Check if it's not the legitimate domain
+        if domain not in _LEGIT_BY_TARGET[target]:
+            is_suspicious = True
+            matched_target = target
+            break
     
     return jsonify({
         'domain': domain,
@@ -406,6 +523,106 @@ def deep_scan():
     })
 
 
+@scanner_bp.route('/deep-scan/stream', methods=['POST'])
+def deep_scan_stream():
+    """
+    Streaming variant of /deep-scan emitting NDJSON.
+
+    Basic DNS results are streamed as they resolve (tagged "phase": "basic"),
+    followed by one deep-analysis object per candidate ("phase": "deep"),
+    and a closing summary object.
+    """
+    import asyncio
+
+    data = request.json
+    if not data or 'domain' not in data:
+        return jsonify({'error': 'Domain is required'}), 400
+
+    target_domain = data['domain'].strip().lower()
+    include_screenshots = data.get('include_screenshots', True)
+    include_dom = data.get('include_dom', True)
+    analyze_registered_only = data.get('analyze_registered_only', True)
+
+    # Remove protocol if present
+    if '://' in target_domain:
+        target_domain = target_domain.split('://')[1]
+    target_domain = target_domain.split('/')[0]
+
+    fuzzer = SimpleFuzzer(target_domain)
+    permutations = fuzzer.generate()
+
+    def generate():
+        start_time = time.time()
+        basic_results = []
+
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=20)
+        try:
+            futures = {executor.submit(resolve_domain, p['domain']): p for p in permutations}
+
+            for future in concurrent.futures.as_completed(futures, timeout=30):
+                perm = futures[future]
+                try:
+                    dns_result = future.result()
+                    result = {**dns_result, 'fuzzer': perm['fuzzer']}
+                    result = calculate_risk(result, target_domain)
+                    basic_results.append(result)
+                    yield _json_line({**result, 'phase': 'basic'})
+                except Exception as e:
+                    logger.error(f"Error resolving {perm['domain']}: {e}")
+        finally:
+            executor.shutdown(wait=False)
+
+        basic_results.sort(key=lambda x: x['risk_score'], reverse=True)
+
+        if analyze_registered_only:
+            candidates = [r for r in basic_results if r['is_registered']][:10]
+        else:
+            candidates = basic_results[:10]
+
+        deep_count = 0
+        if candidates:
+            try:
+                from deep_analyzer import get_deep_analyzer
+                analyzer = get_deep_analyzer()
+
+                loop = asyncio.new_event_loop()
+                asyncio.set_event_loop(loop)
+                try:
+                    for c in candidates:
+                        try:
+                            result = loop.run_until_complete(
+                                analyzer.analyze(
+                                    c['domain'],
+                                    target_domain,
+                                    include_screenshot=include_screenshots,
+                                    include_dom=include_dom
+                                )
+                            )
+                            deep_count += 1
+                            yield _json_line({**result.to_dict(), 'phase': 'deep'})
+                        except Exception as e:
+                            logger.error(f"Deep analysis error: {e}")
+                finally:
+                    loop.close()
+            except ImportError as e:
+                logger.warning(f"Deep analyzer not available: {e}")
+
+        registered = [r for r in basic_results if r['is_registered']]
+        high_risk = [r for r in basic_results if r['risk_score'] >= 70]
+
+        yield _json_line({
+            'summary': True,
+            'target': target_domain,
+            'total_permutations': len(basic_results),
+            'registered_count': len(registered),
+            'high_risk_count': len(high_risk),
+            'deep_analysis_count': deep_count,
+            'scan_time': round(time.time() - start_time, 2)
+        })
+
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+
 @scanner_bp.route('/analyze-single', methods=['POST'])
 def analyze_single():
     """
@@ -432,11 +649,9 @@ def analyze_single():
     
     # If no target specified, try to detect
     if not target_domain:
-        thai_targets = ['kbank', 'scb', 'kasikorn', 'bangkok', 'krungsri', 'ttb', 'gsb', 'lazada', 'shopee', 'line']
-        for t in thai_targets:
-            if t in domain:
-                target_domain = f"{t}.com"
-                break
+        m = _THAI_RE.search(domain)
+        if m:
+            target_domain = f"{m.group(1)}.com"
     
     if not target_domain:
         target_domain = domain  # Analyze without comparison
@@ -186,6 +186,98 @@ class ScreenshotService:
         
         return result
     
+    async def capture_and_extract(self, url: str, full_page: bool = False) -> Optional[Dict]:
+        """
+        Capture a screenshot and extract page content in a single navigation.
+
+        capture_screenshot + extract_page_content each launch a browser and
+        load the page; for deep-scan flows that want both, this fuses them
+        into one page.goto, halving render time and traffic to the target.
+
+        Returns:
+            The extract_page_content dictionary with an extra 'screenshot'
+            key (raw PNG bytes, or None if the capture failed).
+        """
+        if not HAS_PLAYWRIGHT:
+            logger.warning("Playwright not available, returning None")
+            return None
+
+        if not url.startswith(('http://', 'https://')):
+            url = f'https://{url}'
+
+        result = {
+            'url': url,
+            'title': '',
+            'text': '',
+            'forms': [],
+            'has_password_field': False,
+            'has_login_form': False,
+            'external_links': [],
+            'images': [],
+            'screenshot': None,
+            'error': None
+        }
+
+        try:
+            async with async_playwright() as p:
+                browser = await p.chromium.launch(headless=True)
+                context = await browser.new_context(
+                    viewport={'width': 1280, 'height': 720},
+                    user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+                )
+                page = await context.new_page()
+
+                try:
+                    await page.goto(url, timeout=self.TIMEOUT, wait_until='domcontentloaded')
+
+                    # Independent reads can run concurrently on the same page
+                    screenshot, title, text, password_fields = await asyncio.gather(
+                        page.screenshot(full_page=full_page),
+                        page.title(),
+                        page.inner_text('body'),
+                        page.query_selector_all('input[type="password"]')
+                    )
+                    result['screenshot'] = screenshot
+                    result['title'] = title
+                    result['text'] = text
+                    result['has_password_field'] = len(password_fields) > 0
+
+                    # Get forms
+                    forms = await page.query_selector_all('form')
+                    for form in forms:
+                        form_data = {
+                            'action': await form.get_attribute('action') or '',
+                            'method': await form.get_attribute('method') or 'get',
+                            'inputs': []
+                        }
+
+                        inputs = await form.query_selector_all('input')
+                        for inp in inputs:
+                            input_type = await inp.get_attribute('type') or 'text'
+                            input_name = await inp.get_attribute('name') or ''
+                            form_data['inputs'].append({
+                                'type': input_type,
+                                'name': input_name
+                            })
+
+                            if input_type == 'password':
+                                result['has_login_form'] = True
+
+                        result['forms'].append(form_data)
+
+                except PlaywrightTimeout:
+                    logger.warning(f"Timeout loading {url}")
+                    result['error'] = 'timeout'
+                except Exception as e:
+                    result['error'] = str(e)
+
+                await browser.close()
+
+        except Exception as e:
+            result['error'] = str(e)
+
+        return result
+
     async def detect_form_fields(self, url: str) -> List[Dict]:
         """
         Detect form fields on a page for the poisoning bot.
@@ -277,3 +369,29 @@ def create_screenshot_routes(bp):
             return jsonify(content)
         else:
             return jsonify({'error': 'Failed to extract content'}), 500
+
+    @bp.route('/capture-and-extract', methods=['POST'])
+    def capture_and_extract():
+        """Capture screenshot and extract content in one navigation."""
+        data = request.json
+        if not data or 'url' not in data:
+            return jsonify({'error': 'URL is required'}), 400
+
+        url = data['url']
+        service = get_screenshot_service()
+
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            result = loop.run_until_complete(service.capture_and_extract(url))
+        finally:
+            loop.close()
+
+        if result:
+            screenshot = result.pop('screenshot', None)
+            if screenshot:
+                result['screenshot'] = base64.b64encode(screenshot).decode('utf-8')
+                result['format'] = 'png'
+            return jsonify(result)
+        else:
+            return jsonify({'error': 'Failed to capture page'}), 500
@@ -0,0 +1,20 @@
+"""Build script for the optional Cython fuzzer kernels.
+
+Usage:
+    pip install cython
+    python setup.py build_ext --inplace
+
+watchtower.py falls back to its pure-Python generators when the
+extension has not been built, so this step is never required.
+"""
+from setuptools import setup
+
+try:
+    from Cython.Build import cythonize
+except ImportError:
+    raise SystemExit("Cython is required to build watchtower_fuzz: pip install cython")
+
+setup(
+    name='watchtower-fuzz',
+    ext_modules=cythonize('watchtower_fuzz.pyx'),
+)
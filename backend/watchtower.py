@@ -20,6 +20,7 @@ Usage:
     python watchtower.py --test             # Test with sample domains
 """
 
+import bisect
 import certstream
 import json
 import re
@@ -31,10 +32,50 @@ import argparse
 from datetime import datetime
 from typing import List, Set, Dict, Optional, Tuple, Generator
 from dataclasses import dataclass, field, asdict
-from collections import defaultdict
+from collections import defaultdict, deque, OrderedDict
+from functools import lru_cache
+import concurrent.futures
+import queue
 import threading
 import time
 
+# Optional C-backed multi-pattern matcher; falls back to pure Python
+try:
+    import ahocorasick
+    HAS_AHOCORASICK = True
+except ImportError:
+    HAS_AHOCORASICK = False
+
+# Optional static trie used for the containment scan when pyahocorasick
+# is not installed; far smaller and faster than the linear fallback
+try:
+    import marisa_trie
+    HAS_MARISA = True
+except ImportError:
+    HAS_MARISA = False
+
+# Optional NumPy for vectorized candidate generation
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+# Optional Cython-compiled fuzzer kernels, built manually with
+# `python setup.py build_ext --inplace` (see watchtower_fuzz.pyx)
+try:
+    import watchtower_fuzz as _fuzz_ext
+    HAS_FUZZ_EXT = True
+except ImportError:
+    HAS_FUZZ_EXT = False
+
+if HAS_NUMPY:
+    # Bit-flip masks and a 256-entry valid-domain-byte lookup table used by
+    # the vectorized bitsquatting path
+    _BITSQUAT_MASKS = np.array([1, 2, 4, 8, 16, 32, 64, 128], dtype=np.uint8)
+    _VALID_BYTE_LUT = np.zeros(256, dtype=bool)
+    _VALID_BYTE_LUT[list(b'abcdefghijklmnopqrstuvwxyz0123456789-')] = True
+
 # Logging setup - ASCII only for Windows compatibility
 logging.basicConfig(
     level=logging.INFO,
@@ -106,91 +147,188 @@ class DomainFuzzer:
         'thailand', 'thai', 'th', 'bkk'
     ]
     
+    # Valid domain bytes for bitsquatting checks
+    _VALID_BYTES = frozenset(b'abcdefghijklmnopqrstuvwxyz0123456789-')
+
     def __init__(self, domain: str):
         """Initialize with a target domain (without TLD)."""
         self.domain = domain.lower().strip()
+        # Byte form used by the single-edit fuzzers, which mutate one
+        # preallocated buffer instead of allocating three str slices per
+        # candidate. Thai-script targets stay on the str fallback path.
+        self._dom_b = self.domain.encode() if self.domain.isascii() else None
         self.permutations: Set[Tuple[str, str]] = set()  # (domain, fuzzer_type)
     
+    # The generators below run millions of iterations while building the
+    # permutation database, so hot attribute lookups (self.domain, the
+    # class dicts' .get) are bound to locals before the loops.
+
     def _bitsquatting(self) -> Generator[str, None, None]:
         """Generate bitsquatting variations (single bit flips)."""
-        masks = [1, 2, 4, 8, 16, 32, 64, 128]
-        chars = set('abcdefghijklmnopqrstuvwxyz0123456789-')
-        for i, c in enumerate(self.domain):
+        masks = (1, 2, 4, 8, 16, 32, 64, 128)
+        dom_b = self._dom_b
+        if dom_b is not None:
+            if HAS_FUZZ_EXT:
+                yield from _fuzz_ext.bitsquatting(dom_b)
+                return
+            if HAS_NUMPY:
+                # XOR every byte with all 8 masks in one broadcast and keep
+                # only the cells that remain valid domain bytes
+                dom = np.frombuffer(dom_b, dtype=np.uint8)
+                grid = dom[None, :] ^ _BITSQUAT_MASKS[:, None]
+                ok = _VALID_BYTE_LUT[grid]
+                buf = bytearray(dom_b)
+                for m_idx, i in zip(*np.nonzero(ok)):
+                    c = buf[i]
+                    buf[i] = grid[m_idx, i]
+                    yield buf.decode()
+                    buf[i] = c
+                return
+            valid = self._VALID_BYTES
+            buf = bytearray(dom_b)
+            for i, c in enumerate(dom_b):
+                for mask in masks:
+                    b = c ^ mask
+                    if b in valid:
+                        buf[i] = b
+                        yield buf.decode()
+                buf[i] = c
+            return
+        domain = self.domain
+        chars = frozenset('abcdefghijklmnopqrstuvwxyz0123456789-')
+        for i, c in enumerate(domain):
+            o = ord(c)
             for mask in masks:
-                b = chr(ord(c) ^ mask)
+                b = chr(o ^ mask)
                 if b in chars:
-                    yield self.domain[:i] + b + self.domain[i+1:]
-    
+                    yield domain[:i] + b + domain[i+1:]
+
     def _homoglyph(self) -> Generator[str, None, None]:
         """Generate homoglyph variations (look-alike characters)."""
-        for i, c in enumerate(self.domain):
-            for g in self.HOMOGLYPHS.get(c, []):
-                yield self.domain[:i] + g + self.domain[i+1:]
+        domain = self.domain
+        glyphs_get = self.HOMOGLYPHS.get
+        empty = ()
+        for i, c in enumerate(domain):
+            for g in glyphs_get(c, empty):
+                yield domain[:i] + g + domain[i+1:]
         # Two-character homoglyphs
-        for i in range(len(self.domain) - 1):
-            pair = self.domain[i:i+2]
-            for g in self.HOMOGLYPHS.get(pair, []):
-                yield self.domain[:i] + g + self.domain[i+2:]
-    
+        for i in range(len(domain) - 1):
+            pair = domain[i:i+2]
+            for g in glyphs_get(pair, empty):
+                yield domain[:i] + g + domain[i+2:]
+
     def _hyphenation(self) -> Generator[str, None, None]:
         """Generate hyphenated variations."""
-        for i in range(1, len(self.domain)):
-            yield self.domain[:i] + '-' + self.domain[i:]
-    
+        domain = self.domain
+        for i in range(1, len(domain)):
+            yield domain[:i] + '-' + domain[i:]
+
     def _insertion(self) -> Generator[str, None, None]:
         """Generate insertion variations (extra characters)."""
-        for i in range(len(self.domain)):
-            c = self.domain[i]
-            for ins in self.QWERTY.get(c, ''):
-                yield self.domain[:i] + ins + self.domain[i:]
-                yield self.domain[:i+1] + ins + self.domain[i+1:]
-    
+        domain = self.domain
+        qwerty_get = self.QWERTY.get
+        for i, c in enumerate(domain):
+            for ins in qwerty_get(c, ''):
+                yield domain[:i] + ins + domain[i:]
+                yield domain[:i+1] + ins + domain[i+1:]
+
     def _omission(self) -> Generator[str, None, None]:
         """Generate omission variations (missing characters)."""
-        for i in range(len(self.domain)):
-            yield self.domain[:i] + self.domain[i+1:]
-    
+        domain = self.domain
+        for i in range(len(domain)):
+            yield domain[:i] + domain[i+1:]
+
     def _repetition(self) -> Generator[str, None, None]:
         """Generate repetition variations (doubled characters)."""
-        for i, c in enumerate(self.domain):
-            yield self.domain[:i] + c + self.domain[i:]
-    
+        domain = self.domain
+        for i, c in enumerate(domain):
+            yield domain[:i] + c + domain[i:]
+
     def _replacement(self) -> Generator[str, None, None]:
         """Generate replacement variations (adjacent key typos)."""
-        for i, c in enumerate(self.domain):
-            for r in self.QWERTY.get(c, ''):
-                yield self.domain[:i] + r + self.domain[i+1:]
-    
+        qwerty_get = self.QWERTY.get
+        dom_b = self._dom_b
+        if dom_b is not None:
+            if HAS_FUZZ_EXT:
+                yield from _fuzz_ext.replacement(dom_b, _QWERTY_ADJ)
+                return
+            buf = bytearray(dom_b)
+            for i, c in enumerate(dom_b):
+                for r in qwerty_get(chr(c), ''):
+                    buf[i] = ord(r)
+                    yield buf.decode()
+                buf[i] = c
+            return
+        domain = self.domain
+        for i, c in enumerate(domain):
+            for r in qwerty_get(c, ''):
+                yield domain[:i] + r + domain[i+1:]
+
     def _transposition(self) -> Generator[str, None, None]:
         """Generate transposition variations (swapped characters)."""
-        for i in range(len(self.domain) - 1):
-            yield self.domain[:i] + self.domain[i+1] + self.domain[i] + self.domain[i+2:]
-    
+        dom_b = self._dom_b
+        if dom_b is not None:
+            if HAS_FUZZ_EXT:
+                yield from _fuzz_ext.transposition(dom_b)
+                return
+            buf = bytearray(dom_b)
+            for i in range(len(buf) - 1):
+                buf[i], buf[i+1] = buf[i+1], buf[i]
+                yield buf.decode()
+                buf[i], buf[i+1] = buf[i+1], buf[i]
+            return
+        domain = self.domain
+        for i in range(len(domain) - 1):
+            yield domain[:i] + domain[i+1] + domain[i] + domain[i+2:]
+
     def _vowel_swap(self) -> Generator[str, None, None]:
         """Generate vowel swap variations."""
+        dom_b = self._dom_b
+        if dom_b is not None:
+            if HAS_FUZZ_EXT:
+                yield from _fuzz_ext.vowel_swap(dom_b)
+                return
+            vowel_bytes = b'aeiou'
+            buf = bytearray(dom_b)
+            for i, c in enumerate(dom_b):
+                if c in vowel_bytes:
+                    for v in vowel_bytes:
+                        if v != c:
+                            buf[i] = v
+                            yield buf.decode()
+                    buf[i] = c
+            return
+        domain = self.domain
         vowels = 'aeiou'
-        for i, c in enumerate(self.domain):
+        for i, c in enumerate(domain):
             if c in vowels:
                 for v in vowels:
                     if v != c:
-                        yield self.domain[:i] + v + self.domain[i+1:]
-    
+                        yield domain[:i] + v + domain[i+1:]
+
     def _addition(self) -> Generator[str, None, None]:
         """Generate addition variations (common phishing prefixes/suffixes)."""
+        domain = self.domain
         for word in self.ADDITIONS:
-            yield word + self.domain
-            yield self.domain + word
-            yield word + '-' + self.domain
-            yield self.domain + '-' + word
-    
+            yield word + domain
+            yield domain + word
+            yield word + '-' + domain
+            yield domain + '-' + word
+
     def _subdomain_simulation(self) -> Generator[str, None, None]:
         """Generate subdomain-style variations."""
-        for i in range(1, len(self.domain)):
-            if self.domain[i] not in '-.' and self.domain[i-1] not in '-.':
-                yield self.domain[:i] + '.' + self.domain[i:]
-    
-    def generate_all(self) -> Set[Tuple[str, str]]:
-        """Generate all permutations and return as set of (domain, type) tuples."""
+        domain = self.domain
+        for i in range(1, len(domain)):
+            if domain[i] not in '-.' and domain[i-1] not in '-.':
+                yield domain[:i] + '.' + domain[i:]
+
+    def generate_all(self, include_addition: bool = True) -> Set[Tuple[str, str]]:
+        """Generate all permutations and return as set of (domain, type) tuples.
+
+        ``include_addition=False`` leaves out the addition fuzzer; callers
+        that can recognize word+target combinations at query time (see
+        PermutationDatabase) skip materializing them here.
+        """
         fuzzers = [
             ('bitsquatting', self._bitsquatting),
             ('homoglyph', self._homoglyph),
@@ -201,21 +339,33 @@ class DomainFuzzer:
             ('replacement', self._replacement),
             ('transposition', self._transposition),
             ('vowel-swap', self._vowel_swap),
-            ('addition', self._addition),
         ]
-        
+        if include_addition:
+            fuzzers.append(('addition', self._addition))
+
         self.permutations = set()
+        original = self.domain
+        add = self.permutations.add
         for name, func in fuzzers:
             for domain in func():
-                if domain and domain != self.domain:
-                    self.permutations.add((domain, name))
-        
+                if domain and domain != original:
+                    add((domain, name))
+
         return self.permutations
     
     def count(self) -> int:
         return len(self.permutations)
 
 
+# 256-entry adjacency table handed to the compiled replacement kernel:
+# byte value -> bytes of neighbouring QWERTY keys
+if HAS_FUZZ_EXT:
+    _QWERTY_ADJ = tuple(
+        DomainFuzzer.QWERTY.get(chr(i), '').encode('ascii')
+        for i in range(256)
+    )
+
+
 # ============================================================================
 # TARGET CONFIGURATION
 # ============================================================================
@@ -280,68 +430,264 @@ class TargetConfig:
 # PERMUTATION DATABASE
 # ============================================================================
 
+def _fuzz_one(target: str) -> Tuple[str, Set[Tuple[str, str]]]:
+    """Generate all permutations for one target (module-level so it pickles).
+
+    Addition permutations (word+target combinations) are excluded: they are
+    ~40% of the output and PermutationDatabase recognizes them at lookup
+    time by stripping the ADDITIONS vocabulary instead.
+    """
+    return target, DomainFuzzer(target).generate_all(include_addition=False)
+
+
 class PermutationDatabase:
     """
     Pre-computed database of all target domain permutations.
     Used for O(1) lookup when checking incoming domains.
     """
     
-    def __init__(self, config: TargetConfig):
+    def __init__(self, config: TargetConfig, lazy: bool = False):
         self.config = config
-        self.permutations: Dict[str, Tuple[str, str]] = {}  # domain -> (target, fuzzer_type)
+        self._permutations: Dict[str, Tuple[str, str]] = {}  # domain -> (target, fuzzer_type)
         self.targets_generated: Set[str] = set()
-        self._build_database()
-    
+        # Bare target names, used to recognize addition permutations at
+        # lookup time instead of storing every word+target combination
+        self._bare_targets: Dict[str, str] = {}
+        self._automaton = None
+        self._trie = None
+        self._prescan = None
+        self._targets_ac = None
+        self._bloom = None
+        self._bloom_mask = 0
+        # lazy=True defers generation until the first query, so embedders
+        # (e.g. the Flask service) start instantly and only pay the build
+        # cost when a domain actually needs checking
+        self._built = False
+        self._build_lock = threading.Lock()
+        if not lazy:
+            self._ensure_built()
+
+    @property
+    def permutations(self) -> Dict[str, Tuple[str, str]]:
+        """The permutation dict; materialized on first access."""
+        self._ensure_built()
+        return self._permutations
+
+    def _ensure_built(self):
+        """Build the database once, on whichever thread needs it first."""
+        if self._built:
+            return
+        with self._build_lock:
+            if not self._built:
+                self._build_database()
+                self._built = True
+
     def _build_database(self):
         """Build the permutation database for all targets."""
         logger.info("Building permutation database...")
-        
-        for target in self.config.get_all_targets():
-            fuzzer = DomainFuzzer(target)
-            perms = fuzzer.generate_all()
-            
+
+        targets = self.config.get_all_targets()
+
+        # Fuzzing each target is independent CPU work, so fan it out across
+        # cores; fall back to serial generation if a pool cannot start
+        # (restricted environments, missing semaphores, etc.)
+        try:
+            with concurrent.futures.ProcessPoolExecutor() as executor:
+                results = list(executor.map(_fuzz_one, targets, chunksize=2))
+        except Exception as e:
+            logger.warning("Parallel build unavailable (%s); building serially", e)
+            results = [_fuzz_one(t) for t in targets]
+
+        for target, perms in results:
+            # Targets and fuzzer names form a closed vocabulary (~31 x 10)
+            # repeated across every dict value and later every Detection;
+            # interning shares one str object per name and makes stats
+            # counter keying a pointer compare.
+            target = sys.intern(target)
+            self._bare_targets[target] = target
             for domain, fuzzer_type in perms:
                 # Store mapping: permutation -> (original target, fuzzer type)
-                if domain not in self.permutations:
-                    self.permutations[domain] = (target, fuzzer_type)
-            
+                if domain not in self._permutations:
+                    self._permutations[domain] = (target, sys.intern(fuzzer_type))
+
             self.targets_generated.add(target)
-        
-        logger.info("Database built: %d permutations for %d targets", 
-                   len(self.permutations), len(self.targets_generated))
-    
+
+        if HAS_AHOCORASICK:
+            # Compile all permutation keys into one automaton so the
+            # containment scan in lookup() is a single O(len(domain)) DFA
+            # pass instead of an O(N_perms) Python loop per CT domain.
+            automaton = ahocorasick.Automaton()
+            for perm, payload in self._permutations.items():
+                automaton.add_word(perm, payload)
+            automaton.make_automaton()
+            self._automaton = automaton
+
+            # Prescan automaton: permutations plus the bare target names,
+            # so one sweep of a whole certificate's SANs can rule out
+            # every domain that neither lookup() nor
+            # contains_target_keyword() could possibly match
+            prescan = ahocorasick.Automaton()
+            for perm in self._permutations:
+                prescan.add_word(perm, True)
+            for target in self._bare_targets:
+                prescan.add_word(target, True)
+            prescan.make_automaton()
+            self._prescan = prescan
+
+            # Bare targets on their own, for contains_target_keyword:
+            # one DFA pass instead of ~31 Python substring tests
+            targets_ac = ahocorasick.Automaton()
+            for target in self._bare_targets:
+                targets_ac.add_word(target, target)
+            targets_ac.make_automaton()
+            self._targets_ac = targets_ac
+        elif HAS_MARISA:
+            # LOUDS-encoded static trie: containment becomes a handful of
+            # prefix walks (one per start offset) instead of an O(N_perms)
+            # scan, at a fraction of the dict's memory
+            self._trie = marisa_trie.Trie(self._permutations.keys())
+
+        if HAS_NUMPY:
+            self._build_bloom()
+
+        logger.info("Database built: %d permutations for %d targets",
+                   len(self._permutations), len(self.targets_generated))
+
+    def _build_bloom(self):
+        """Build a blocked Bloom filter over every label lookup() can match.
+
+        The per-label stage of lookup() probes the permutation dict and
+        runs the ADDITIONS strip loop for each domain part; almost all CT
+        labels match neither. The filter covers the permutation keys plus
+        the four addition shapes per word/target pair (word+target,
+        word-target, target+word, target-word) — exactly what that stage
+        can hit — so a negative answer skips the whole stage. Each key
+        sets three bits inside a single uint64 block, so a miss costs one
+        hash and one 8-byte load (~16 bits/key, <1% false positives;
+        a false positive just falls through to the probes).
+        """
+        keys = list(self._permutations)
+        for target in self._bare_targets:
+            for word in DomainFuzzer.ADDITIONS:
+                keys.append(word + target)
+                keys.append(word + '-' + target)
+                keys.append(target + word)
+                keys.append(target + '-' + word)
+
+        n_blocks = 64
+        while n_blocks * 64 < 16 * len(keys):
+            n_blocks <<= 1
+        self._bloom_mask = n_blocks - 1
+        bloom = np.zeros(n_blocks, dtype=np.uint64)
+        for key in keys:
+            h = hash(key) & 0xFFFFFFFFFFFFFFFF
+            mask = (1 << (h & 63)) | (1 << ((h >> 6) & 63)) | (1 << ((h >> 12) & 63))
+            bloom[(h >> 18) & self._bloom_mask] |= np.uint64(mask)
+        # Plain ints index faster than numpy scalars on single-element reads
+        self._bloom = bloom.tolist()
+
+    def _bloom_contains(self, label: str) -> bool:
+        h = hash(label) & 0xFFFFFFFFFFFFFFFF
+        mask = (1 << (h & 63)) | (1 << ((h >> 6) & 63)) | (1 << ((h >> 12) & 63))
+        return self._bloom[(h >> 18) & self._bloom_mask] & mask == mask
+
     def lookup(self, domain: str) -> Optional[Tuple[str, str]]:
         """
         Look up a domain in the database.
         Returns (target, fuzzer_type) if found, None otherwise.
         """
+        self._ensure_built()
+
         # Extract the domain name without TLD and subdomains
         parts = domain.lower().split('.')
-        
-        # Check various parts of the domain
+
+        # Check various parts of the domain; the Bloom filter rejects
+        # labels that can match neither the dict nor the addition
+        # stripper before either is paid for
+        bloom = self._bloom
         for i, part in enumerate(parts):
-            if part in self.permutations:
-                return self.permutations[part]
-            
+            if bloom is None or self._bloom_contains(part):
+                if part in self._permutations:
+                    return self._permutations[part]
+
+                addition = self._addition_lookup(part)
+                if addition is not None:
+                    return addition
+
             # Check combined parts (e.g., kbank-secure)
             if i < len(parts) - 1:
                 combined = part + parts[i + 1]
-                if combined in self.permutations:
-                    return self.permutations[combined]
-        
+                if bloom is None or self._bloom_contains(combined):
+                    if combined in self._permutations:
+                        return self._permutations[combined]
+                    addition = self._addition_lookup(combined)
+                    if addition is not None:
+                        return addition
+
         # Also check if the full domain (minus TLD) is in the database
         if len(parts) >= 2:
             domain_without_tld = '.'.join(parts[:-1])
-            for perm in self.permutations:
-                if perm in domain_without_tld:
-                    return self.permutations[perm]
-        
+            if self._automaton is not None:
+                for _, payload in self._automaton.iter(domain_without_tld):
+                    return payload
+            elif self._trie is not None:
+                for i in range(len(domain_without_tld)):
+                    for perm in self._trie.prefixes(domain_without_tld[i:]):
+                        return self._permutations[perm]
+            else:
+                for perm in self._permutations:
+                    if perm in domain_without_tld:
+                        return self._permutations[perm]
+
         return None
-    
+
+    def prescan(self, blob: str):
+        """One automaton sweep over a joined SAN blob.
+
+        Returns an iterator of (end_index, payload) hits, or None when
+        the automaton backend is unavailable and callers must check each
+        domain individually.
+        """
+        self._ensure_built()
+        if self._prescan is None:
+            return None
+        return self._prescan.iter(blob)
+
+    def _addition_lookup(self, label: str) -> Optional[Tuple[str, str]]:
+        """Recognize addition permutations without storing them.
+
+        Strips each ADDITIONS word (with an optional hyphen) from the front
+        or back of the label and checks whether the residual is a bare
+        target. Equivalent to the word+target entries the addition fuzzer
+        used to put in the database, at a fraction of the memory.
+        """
+        bare = self._bare_targets
+        for word in DomainFuzzer.ADDITIONS:
+            if label.startswith(word):
+                rest = label[len(word):]
+                if rest[:1] == '-':
+                    rest = rest[1:]
+                target = bare.get(rest)
+                if target is not None:
+                    return (target, 'addition')
+            if label.endswith(word):
+                rest = label[:-len(word)]
+                if rest[-1:] == '-':
+                    rest = rest[:-1]
+                target = bare.get(rest)
+                if target is not None:
+                    return (target, 'addition')
+        return None
+
     def contains_target_keyword(self, domain: str) -> Optional[str]:
         """Check if domain contains any target keyword directly."""
+        self._ensure_built()
         domain_lower = domain.lower()
-        for target in self.config.get_all_targets():
+        if self._targets_ac is not None:
+            for _, target in self._targets_ac.iter(domain_lower):
+                return target
+            return None
+        for target in self._bare_targets:
             if target in domain_lower:
                 return target
         return None
@@ -351,7 +697,11 @@ class PermutationDatabase:
 # DETECTION RESULT
 # ============================================================================
 
-@dataclass
+# slots=True: monitor sessions hold thousands of these in self.detections
+# and the recent-detections deque; slots drop the per-instance __dict__.
+# frozen=True: detections are write-once records — factors are assembled
+# before construction and never rebound afterwards.
+@dataclass(slots=True, frozen=True)
 class Detection:
     """Represents a detected suspicious domain."""
     domain: str
@@ -373,18 +723,30 @@ class Detection:
 
 class LiveStats:
     """Real-time statistics with live display."""
-    
+
+    __slots__ = (
+        'start_time', '_start_monotonic', 'certs_processed',
+        'domains_checked', 'detections', 'high_risk',
+        'detections_by_target', 'detections_by_fuzzer',
+        'recent_detections', '_lock', '_last_print',
+    )
+
     def __init__(self):
         self.start_time = datetime.now()
+        # Monotonic clock for rate math; datetime.now() costs a syscall and
+        # a fresh object per call, far too expensive at per-cert frequency
+        self._start_monotonic = time.monotonic()
         self.certs_processed = 0
         self.domains_checked = 0
         self.detections = 0
         self.high_risk = 0
         self.detections_by_target: Dict[str, int] = defaultdict(int)
         self.detections_by_fuzzer: Dict[str, int] = defaultdict(int)
-        self.recent_detections: List[Detection] = []
+        # maxlen deque: append evicts the oldest in O(1) instead of an
+        # O(n) list.pop(0) shift under the lock
+        self.recent_detections: deque = deque(maxlen=100)
         self._lock = threading.Lock()
-        self._last_print = time.time()
+        self._last_print = time.monotonic()
     
     def record_cert(self):
         with self._lock:
@@ -402,31 +764,31 @@ class LiveStats:
             self.detections_by_target[detection.target] += 1
             self.detections_by_fuzzer[detection.fuzzer_type] += 1
             self.recent_detections.append(detection)
-            if len(self.recent_detections) > 100:
-                self.recent_detections.pop(0)
     
     def print_live(self, force: bool = False):
         """Print live statistics (throttled to once per second)."""
-        now = time.time()
+        now = time.monotonic()
         if not force and now - self._last_print < 1.0:
             return
         self._last_print = now
-        
-        runtime = (datetime.now() - self.start_time).total_seconds()
+
+        runtime = now - self._start_monotonic
         rate = self.certs_processed / max(runtime, 1)
-        
-        # Clear line and print stats
-        status = (f"\r[LIVE] Certs: {self.certs_processed:,} | "
-                  f"Domains: {self.domains_checked:,} | "
-                  f"Rate: {rate:.0f}/s | "
-                  f"DETECTIONS: {self.detections} | "
-                  f"HIGH-RISK: {self.high_risk}")
-        
-        print(status, end='', flush=True)
+
+        # One %-formatted write straight to stdout: skips print()'s
+        # argument handling and the f-string's per-field format calls for
+        # a line that is rewritten every second
+        sys.stdout.write(
+            "\r[LIVE] Certs: %s | Domains: %s | Rate: %.0f/s | "
+            "DETECTIONS: %d | HIGH-RISK: %d" % (
+                format(self.certs_processed, ','),
+                format(self.domains_checked, ','),
+                rate, self.detections, self.high_risk))
+        sys.stdout.flush()
     
     def print_summary(self):
         """Print final summary."""
-        runtime = (datetime.now() - self.start_time).total_seconds()
+        runtime = time.monotonic() - self._start_monotonic
         
         print("\n")
         print("=" * 70)
@@ -455,6 +817,67 @@ class LiveStats:
         print("=" * 70)
 
 
+# ============================================================================
+# RISK SCORING
+# ============================================================================
+
+# Keywords commonly used in phishing domains
+_SECURITY_WORDS = ('secure', 'verify', 'login', 'update', 'confirm', 'auth')
+
+# One compiled alternation finds a security keyword in a single scan
+# instead of six Python-level substring checks per domain
+_SEC_RE = re.compile('|'.join(_SECURITY_WORDS))
+
+_DIGIT_RE = re.compile(r'\d')
+
+
+@lru_cache(maxsize=8192)
+def _score_features(fuzzer_type: str, sus_tld: Optional[str], many_hyphens: bool,
+                    long_domain: bool, sec_word: Optional[str],
+                    has_digit: bool) -> Tuple[int, Tuple[str, ...]]:
+    """
+    Score a domain from its extracted features.
+
+    Pure function of the feature tuple, so results are memoized: detection
+    bursts tend to share the same handful of feature combinations.
+    """
+    score = 0
+    factors = []
+
+    # Base score from detection type
+    if fuzzer_type in ('homoglyph', 'bitsquatting'):
+        score += 40
+        factors.append(f"High-risk fuzzer: {fuzzer_type}")
+    elif fuzzer_type in ('addition', 'hyphenation'):
+        score += 30
+        factors.append(f"Medium-risk fuzzer: {fuzzer_type}")
+    else:
+        score += 25
+        factors.append(f"Typosquatting: {fuzzer_type}")
+
+    if sus_tld is not None:
+        score += 25
+        factors.append(f"Suspicious TLD: {sus_tld}")
+
+    if many_hyphens:
+        score += 15
+        factors.append("Multiple hyphens in domain")
+
+    if long_domain:
+        score += 10
+        factors.append("Unusually long domain")
+
+    if sec_word is not None:
+        score += 15
+        factors.append(f"Security keyword: {sec_word}")
+
+    if has_digit:
+        score += 5
+        factors.append("Contains numbers")
+
+    return min(score, 100), tuple(factors)
+
+
 # ============================================================================
 # MAIN WATCHTOWER CLASS
 # ============================================================================
@@ -466,7 +889,14 @@ class Watchtower:
     """
     
     CERTSTREAM_URL = 'wss://certstream.calidog.io/'
-    
+
+    # Worker threads draining the certstream queue. Lookup is dominated by
+    # the C automaton scan (which releases the GIL), so a small pool
+    # genuinely parallelizes.
+    NUM_WORKERS = 4
+    QUEUE_SIZE = 10000
+
+
     def __init__(self, config: Optional[TargetConfig] = None, 
                  output_file: Optional[str] = None):
         self.config = config or TargetConfig()
@@ -476,96 +906,134 @@ class Watchtower:
         self.detections: List[Detection] = []
         self.is_running = False
         self._output_lock = threading.Lock()
-        
+
+        # Dedup front-gate: CT logs repeat the same SANs across log batches,
+        # and most domains miss every target. Remember the last N domains
+        # seen (hits and misses alike) and skip re-analysis on repeats.
+        self._seen_domains: OrderedDict = OrderedDict()
+        self._seen_max = 100_000
+        self._seen_lock = threading.Lock()
+
+        # Analysis runs on worker threads, not on the websocket reader:
+        # the callback only enqueues, so heavy detection bursts cannot
+        # back-pressure the certstream socket. Full queue -> drop and count.
+        self._queue: queue.Queue = queue.Queue(maxsize=self.QUEUE_SIZE)
+        self._workers: List[threading.Thread] = []
+        self.dropped_messages = 0
+
+        # Whitelist as a frozenset plus a suffix tuple: exact match is one
+        # hash probe and endswith() with a tuple is a single C-level
+        # multi-suffix check, versus a Python loop per SAN
+        self._wl_set = frozenset(w.lower() for w in self.config.whitelist)
+        self._wl_suffixes = tuple('.' + w.lower() for w in self.config.whitelist)
+
+        # Single automaton holding suspicious TLDs and security keywords:
+        # one DFA sweep of the domain extracts both risk features instead
+        # of separate Python loops in _calculate_risk
+        self._features_ac = None
+        if HAS_AHOCORASICK:
+            ac = ahocorasick.Automaton()
+            for word in _SECURITY_WORDS:
+                ac.add_word(word, ('sec', word))
+            for tld in self.config.suspicious_tlds:
+                ac.add_word(tld, ('tld', tld))
+            ac.make_automaton()
+            self._features_ac = ac
+
+        # Output file is opened once and kept; reopening per detection cost
+        # a syscall round-trip under the output lock for every hit
+        self._out_fp = None
+        self._out_writer = None
+        self._last_flush = time.monotonic()
+
         if self.output_file:
             self._init_output_file()
-    
+
     def _init_output_file(self):
-        """Initialize output file with headers."""
+        """Open the output file once, writing CSV headers if applicable."""
         if self.output_file.endswith('.csv'):
-            with open(self.output_file, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.writer(f)
-                writer.writerow(['timestamp', 'domain', 'target', 'fuzzer_type', 
-                                'risk_score', 'risk_factors', 'issuer'])
-    
+            self._out_fp = open(self.output_file, 'w', newline='', encoding='utf-8')
+            self._out_writer = csv.writer(self._out_fp)
+            self._out_writer.writerow(['timestamp', 'domain', 'target', 'fuzzer_type',
+                                       'risk_score', 'risk_factors', 'issuer'])
+            self._out_fp.flush()
+        else:  # JSON lines
+            self._out_fp = open(self.output_file, 'a', encoding='utf-8')
+
     def _save_detection(self, detection: Detection):
         """Save detection to output file."""
-        if not self.output_file:
+        if not self._out_fp:
             return
-        
+
         with self._output_lock:
-            if self.output_file.endswith('.csv'):
-                with open(self.output_file, 'a', newline='', encoding='utf-8') as f:
-                    writer = csv.writer(f)
-                    writer.writerow([
-                        detection.detection_time,
-                        detection.domain,
-                        detection.target,
-                        detection.fuzzer_type,
-                        detection.risk_score,
-                        '; '.join(detection.risk_factors),
-                        detection.certificate_issuer
-                    ])
+            if self._out_writer is not None:
+                self._out_writer.writerow([
+                    detection.detection_time,
+                    detection.domain,
+                    detection.target,
+                    detection.fuzzer_type,
+                    detection.risk_score,
+                    '; '.join(detection.risk_factors),
+                    detection.certificate_issuer
+                ])
             else:  # JSON
-                with open(self.output_file, 'a', encoding='utf-8') as f:
-                    f.write(json.dumps(detection.to_dict()) + '\n')
+                self._out_fp.write(json.dumps(detection.to_dict()) + '\n')
+
+            # Flush at most once per second so bursts don't pay a flush
+            # per row; at most the last second of detections is at risk
+            now = time.monotonic()
+            if now - self._last_flush >= 1.0:
+                self._out_fp.flush()
+                self._last_flush = now
     
     def _is_whitelisted(self, domain: str) -> bool:
         """Check if domain is whitelisted."""
         domain_lower = domain.lower()
-        for safe in self.config.whitelist:
-            if domain_lower == safe or domain_lower.endswith('.' + safe):
-                return True
-        return False
+        return domain_lower in self._wl_set or domain_lower.endswith(self._wl_suffixes)
     
     def _calculate_risk(self, domain: str, target: str, fuzzer_type: str) -> Tuple[int, List[str]]:
         """Calculate risk score and factors for a domain."""
-        score = 0
-        factors = []
         domain_lower = domain.lower()
-        
-        # Base score from detection type
-        if fuzzer_type in ['homoglyph', 'bitsquatting']:
-            score += 40
-            factors.append(f"High-risk fuzzer: {fuzzer_type}")
-        elif fuzzer_type in ['addition', 'hyphenation']:
-            score += 30
-            factors.append(f"Medium-risk fuzzer: {fuzzer_type}")
+
+        # Extract the features the score depends on...
+        sus_tld = None
+        sec_word = None
+        if self._features_ac is not None:
+            # One automaton sweep finds TLD and keyword features together.
+            # TLD hits only count when the match ends at the last character
+            # (i.e. the domain actually ends with it); for keywords, keep
+            # the leftmost match to mirror the regex fallback.
+            last = len(domain_lower) - 1
+            sec_start = -1
+            for end, (kind, word) in self._features_ac.iter(domain_lower):
+                if kind == 'tld':
+                    if end == last:
+                        sus_tld = word
+                else:
+                    start = end - len(word) + 1
+                    if sec_word is None or start < sec_start:
+                        sec_word = word
+                        sec_start = start
         else:
-            score += 25
-            factors.append(f"Typosquatting: {fuzzer_type}")
-        
-        # TLD analysis
-        for tld in self.config.suspicious_tlds:
-            if domain_lower.endswith(tld):
-                score += 25
-                factors.append(f"Suspicious TLD: {tld}")
-                break
-        
-        # Multiple hyphens
-        if domain_lower.count('-') >= 2:
-            score += 15
-            factors.append("Multiple hyphens in domain")
-        
-        # Long domain
-        if len(domain_lower) > 30:
-            score += 10
-            factors.append("Unusually long domain")
-        
-        # Security keywords
-        security_words = ['secure', 'verify', 'login', 'update', 'confirm', 'auth']
-        for word in security_words:
-            if word in domain_lower:
-                score += 15
-                factors.append(f"Security keyword: {word}")
-                break
-        
-        # Contains numbers
-        if re.search(r'\d', domain_lower):
-            score += 5
-            factors.append("Contains numbers")
-        
-        return min(score, 100), factors
+            for tld in self.config.suspicious_tlds:
+                if domain_lower.endswith(tld):
+                    sus_tld = tld
+                    break
+            m = _SEC_RE.search(domain_lower)
+            sec_word = m.group(0) if m else None
+
+        # ...then score via the memoized pure function. Attackers register
+        # phishing names in bursts of near-identical shapes, so the feature
+        # tuples repeat heavily.
+        score, factors = _score_features(
+            fuzzer_type,
+            sus_tld,
+            domain_lower.count('-') >= 2,
+            len(domain_lower) > 30,
+            sec_word,
+            _DIGIT_RE.search(domain_lower) is not None,
+        )
+        return score, list(factors)
     
     def _analyze_domain(self, domain: str, cert_data: dict) -> Optional[Detection]:
         """Analyze a domain for phishing indicators."""
@@ -576,7 +1044,8 @@ class Watchtower:
         target = self.db.contains_target_keyword(domain)
         if target:
             # Direct keyword match - high confidence
-            score, factors = self._calculate_risk(domain, target, "keyword-match")
+            fuzzer_type = 'keyword-match'
+            score, factors = self._calculate_risk(domain, target, fuzzer_type)
             factors.insert(0, f"Contains target keyword: {target}")
             score = min(score + 20, 100)
         else:
@@ -597,7 +1066,7 @@ class Watchtower:
         return Detection(
             domain=domain,
             target=target,
-            fuzzer_type=fuzzer_type if 'fuzzer_type' in dir() else 'keyword-match',
+            fuzzer_type=fuzzer_type,
             risk_score=score,
             risk_factors=factors,
             detection_time=datetime.now().isoformat(),
@@ -606,41 +1075,97 @@ class Watchtower:
         )
     
     def _certstream_callback(self, message: dict, context):
-        """Callback for certstream events."""
-        if message.get('message_type') == 'heartbeat':
-            return
-        
+        """Callback for certstream events.
+
+        Runs on the websocket reader thread, so it must stay cheap: filter
+        non-certificate messages and hand the rest to the worker queue.
+        Analysis done here would back-pressure the socket itself.
+        """
         if message.get('message_type') != 'certificate_update':
             return
-        
+
         self.stats.record_cert()
-        
+
+        try:
+            self._queue.put_nowait(message)
+        except queue.Full:
+            # Better to lose a cert during a burst than stall the stream
+            self.dropped_messages += 1
+            if self.dropped_messages % 1000 == 1:
+                logger.warning("Analysis queue full; dropped %d certs so far",
+                               self.dropped_messages)
+
+    def _worker_loop(self):
+        """Drain the certstream queue; exits on the None sentinel."""
+        while True:
+            message = self._queue.get()
+            if message is None:
+                break
+            try:
+                self._process_message(message)
+            finally:
+                self._queue.task_done()
+
+    def _process_message(self, message: dict):
+        """Analyze every SAN on one certificate (runs on a worker thread)."""
         try:
             cert_data = message.get('data', {})
             leaf_cert = cert_data.get('leaf_cert', {})
             all_domains = leaf_cert.get('all_domains', [])
-            
-            for domain in all_domains:
+
+            # Strip wildcard prefixes in one pass; the slice compare avoids
+            # a method lookup per SAN in this per-certificate hot loop
+            all_domains = [d[2:] if d[:2] == '*.' else d for d in all_domains]
+
+            for _ in all_domains:
                 self.stats.record_domain()
-                
-                # Skip wildcards
-                if domain.startswith('*.'):
-                    domain = domain[2:]
-                
-                # Analyze
-                detection = self._analyze_domain(domain, cert_data)
-                
-                if detection:
-                    self.stats.record_detection(detection)
-                    self.detections.append(detection)
-                    self._save_detection(detection)
-                    self._print_detection(detection)
-            
+
+            # Batch prescan: join every SAN (lowered, dots removed so
+            # matches spanning label boundaries still surface) with a
+            # separator no pattern contains, sweep the automaton once,
+            # and only run full analysis on the SANs that had a hit.
+            # CDN certs carry 50-100 SANs; almost all scan clean.
+            hits = self.db.prescan(
+                '\x01'.join(d.replace('.', '').lower() for d in all_domains))
+            if hits is not None:
+                starts = []
+                offset = 0
+                for d in all_domains:
+                    starts.append(offset)
+                    offset += len(d) - d.count('.') + 1  # +1 separator
+                candidates = {bisect.bisect_right(starts, end) - 1
+                              for end, _ in hits}
+                for idx in sorted(candidates):
+                    self._check_domain(all_domains[idx], cert_data)
+            else:
+                for domain in all_domains:
+                    self._check_domain(domain, cert_data)
+
             # Update live stats display
             self.stats.print_live()
-            
+
         except Exception as e:
             logger.error("Error processing cert: %s", str(e))
+
+    def _check_domain(self, domain: str, cert_data: dict):
+        """Dedup, analyze and record one SAN."""
+        # Skip domains analyzed recently (LRU move-to-end on hit)
+        with self._seen_lock:
+            seen = self._seen_domains
+            if domain in seen:
+                seen.move_to_end(domain)
+                return
+            seen[domain] = None
+            if len(seen) > self._seen_max:
+                seen.popitem(last=False)
+
+        detection = self._analyze_domain(domain, cert_data)
+
+        if detection:
+            self.stats.record_detection(detection)
+            self.detections.append(detection)
+            self._save_detection(detection)
+            self._print_detection(detection)
     
     def _print_detection(self, detection: Detection):
         """Print a detection alert."""
@@ -686,7 +1211,12 @@ class Watchtower:
         logger.info("Press Ctrl+C to stop\n")
         
         self.is_running = True
-        
+
+        for _ in range(self.NUM_WORKERS):
+            worker = threading.Thread(target=self._worker_loop, daemon=True)
+            worker.start()
+            self._workers.append(worker)
+
         try:
             certstream.listen_for_events(
                 self._certstream_callback,
@@ -702,6 +1232,25 @@ class Watchtower:
     def stop(self):
         """Stop monitoring and print summary."""
         self.is_running = False
+
+        # Let the workers finish queued certs, then shut them down
+        for _ in self._workers:
+            self._queue.put(None)
+        for worker in self._workers:
+            worker.join(timeout=5)
+        self._workers.clear()
+
+        if self.dropped_messages:
+            logger.warning("Dropped %d certs due to a full analysis queue",
+                           self.dropped_messages)
+
+        if self._out_fp:
+            with self._output_lock:
+                self._out_fp.flush()
+                self._out_fp.close()
+                self._out_fp = None
+                self._out_writer = None
+
         self.stats.print_summary()
         
         if self.detections:
@@ -767,14 +1316,16 @@ def run_test_mode() -> None:
         'google.com',
     ]
     
+    wl_set = frozenset(w.lower() for w in config.whitelist)
+    wl_suffixes = tuple('.' + w.lower() for w in config.whitelist)
+
     detections = 0
     for domain in test_domains:
         target = db.contains_target_keyword(domain)
         result = db.lookup(domain)
-        
-        is_whitelist = any(domain == w or domain.endswith('.' + w) 
-                          for w in config.whitelist)
-        
+
+        is_whitelist = domain in wl_set or domain.endswith(wl_suffixes)
+
         if is_whitelist:
             status = "[WHITELIST]"
         elif target or result:
@@ -10,13 +10,48 @@ import time
 import csv
 import json
 import os
+import queue
+import re
+import sys
 from datetime import datetime
 from typing import List, Dict, Optional
 from dataclasses import dataclass, asdict, field
-from collections import defaultdict
+from collections import Counter, deque
+from functools import lru_cache, partial
+from itertools import islice
+import concurrent.futures
 from flask import Blueprint, jsonify, request
 from flask_socketio import SocketIO, emit
 
+# Optional fast JSON serialization for CSV cells and socket payloads
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+# Optional vectorized CSV ingestion for cold-start detection loads
+try:
+    import pandas as pd
+    HAS_PANDAS = True
+except ImportError:
+    HAS_PANDAS = False
+
+# Optional SIMD-accelerated edit distance for the fuzzy prefilter
+try:
+    from rapidfuzz import process as rf_process
+    from rapidfuzz.distance import DamerauLevenshtein
+    HAS_RAPIDFUZZ = True
+except ImportError:
+    HAS_RAPIDFUZZ = False
+
+# Optional flat array counters for the stats breakdowns
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
 # Import from watchtower
 from watchtower import (
     DomainFuzzer, TargetConfig, PermutationDatabase, 
@@ -31,6 +66,65 @@ _watchtower_instance: Optional['WatchtowerService'] = None
 _socketio: Optional[SocketIO] = None
 
 
+def _dump_factors(factors: List[str]) -> str:
+    """Serialize risk_factors for a CSV cell as a JSON array."""
+    if HAS_ORJSON:
+        return orjson.dumps(factors).decode()
+    return json.dumps(factors, separators=(',', ':'))
+
+
+def _load_factors(raw: str) -> List[str]:
+    """Parse a risk_factors cell; accepts the legacy '; '-joined format."""
+    if raw.startswith('['):
+        try:
+            return orjson.loads(raw) if HAS_ORJSON else json.loads(raw)
+        except ValueError:
+            pass
+    return raw.split('; ')
+
+
+@lru_cache(maxsize=4096)
+def _score_features(fuzzer_type: str, sus_tld: Optional[str], many_hyphens: bool,
+                    long_domain: bool, sec_word: Optional[str]):
+    """Score a domain from its extracted risk features.
+
+    Pure function of the feature tuple, so results are memoized (the same
+    shapes repeat heavily during detection bursts); _calculate_risk only
+    pays for feature extraction per call.
+    """
+    score = 0
+    factors = []
+
+    # Base score from detection type
+    if fuzzer_type in ('homoglyph', 'bitsquatting'):
+        score += 40
+        factors.append(f"High-risk fuzzer: {fuzzer_type}")
+    elif fuzzer_type in ('addition', 'hyphenation'):
+        score += 30
+        factors.append(f"Medium-risk fuzzer: {fuzzer_type}")
+    else:
+        score += 25
+        factors.append(f"Typosquatting: {fuzzer_type}")
+
+    if sus_tld is not None:
+        score += 25
+        factors.append(f"Suspicious TLD: {sus_tld}")
+
+    if many_hyphens:
+        score += 15
+        factors.append("Multiple hyphens in domain")
+
+    if long_domain:
+        score += 10
+        factors.append("Unusually long domain")
+
+    if sec_word is not None:
+        score += 15
+        factors.append(f"Security keyword: {sec_word}")
+
+    return min(score, 100), tuple(factors)
+
+
 class WatchtowerService:
     """
     Service wrapper for Watchtower that integrates with Flask-SocketIO.
@@ -40,16 +134,56 @@ class WatchtowerService:
     def __init__(self, socketio: SocketIO, output_file: str = "detections.csv"):
         self.socketio = socketio
         self.config = TargetConfig()
-        self.db = PermutationDatabase(self.config)
-        self.stats = WatchtowerStats()
+        # lazy: the API process should come up fast; the database
+        # materializes on the first domain lookup instead of at import
+        self.db = PermutationDatabase(self.config, lazy=True)
+        self.stats = WatchtowerStats(self.config.get_all_targets())
         self.output_file = output_file
-        self.detections: List[Detection] = []
+        # Bounded, time-ordered: maxlen caps memory for long-running
+        # services and keeps get_detections sort-free
+        self.detections: deque = deque(maxlen=10_000)
         self.is_running = False
         self._thread: Optional[threading.Thread] = None
         self._lock = threading.Lock()
-        
+        self._pool: Optional[concurrent.futures.ThreadPoolExecutor] = None
+
+        # Whitelist as a frozenset plus a suffix tuple (same layout as
+        # watchtower.Watchtower): exact match is one hash probe and the
+        # subdomain check is a single C-level multi-suffix endswith,
+        # instead of a Python loop per domain at CertStream rates
+        self._wl_set = frozenset(w.lower() for w in self.config.whitelist)
+        self._wl_suffixes = tuple('.' + w.lower() for w in self.config.whitelist)
+
+        # Target list for the RapidFuzz prefilter in _analyze_domain
+        self._target_list = list(self.config.get_all_targets())
+
+        # Compiled alternations: one scan of the domain replaces the
+        # per-detection Python loops over TLDs and security keywords
+        self._tld_re = re.compile(
+            '|'.join(re.escape(t) + '$' for t in self.config.suspicious_tlds))
+        self._secword_re = re.compile(
+            '|'.join(('secure', 'verify', 'login', 'update', 'confirm', 'auth')))
+
+
         # Load existing detections from CSV
         self._load_existing_detections()
+
+        # Detections are queued and written by a background thread in
+        # batches: the old per-row open/append/close cost a syscall
+        # round-trip on the certstream callback for every hit
+        self._csv_queue: queue.Queue = queue.Queue()
+        self._writer_thread: Optional[threading.Thread] = None
+
+        # Last stats snapshot sent over the socket, for delta emission
+        self._last_emitted_stats: Dict = {}
+        had_rows = os.path.exists(self.output_file) and os.path.getsize(self.output_file) > 0
+        self._csv_fh = open(self.output_file, 'a', newline='', encoding='utf-8',
+                            buffering=1 << 16)
+        self._csv_writer = csv.writer(self._csv_fh)
+        if not had_rows:
+            self._csv_writer.writerow(['timestamp', 'domain', 'target', 'fuzzer_type',
+                                       'risk_score', 'risk_factors', 'issuer'])
+            self._csv_fh.flush()
     
     def _load_existing_detections(self):
         """Load existing detections from CSV file."""
@@ -57,21 +191,51 @@ class WatchtowerService:
             return
         
         try:
-            with open(self.output_file, 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    if row.get('domain'):
-                        detection = Detection(
-                            domain=row.get('domain', ''),
-                            target=row.get('target', ''),
-                            fuzzer_type=row.get('fuzzer_type', ''),
-                            risk_score=int(row.get('risk_score', 0)),
-                            risk_factors=row.get('risk_factors', '').split('; '),
-                            detection_time=row.get('timestamp', ''),
-                            certificate_issuer=row.get('issuer', '')
-                        )
-                        self.detections.append(detection)
-                        self.stats.record_detection(detection)
+            if HAS_PANDAS:
+                # One C-level parse of the whole file; row-by-row
+                # DictReader blocks init for tens of seconds once the
+                # history grows to 100k+ rows
+                df = pd.read_csv(self.output_file, dtype=str, keep_default_na=False)
+                loaded = [
+                    Detection(
+                        domain=row.domain,
+                        target=sys.intern(row.target),
+                        fuzzer_type=sys.intern(row.fuzzer_type),
+                        risk_score=int(row.risk_score or 0),
+                        risk_factors=_load_factors(row.risk_factors),
+                        detection_time=row.timestamp,
+                        certificate_issuer=row.issuer
+                    )
+                    for row in df.itertuples() if row.domain
+                ]
+            else:
+                loaded = []
+                with open(self.output_file, 'r', encoding='utf-8') as f:
+                    reader = csv.DictReader(f)
+                    for row in reader:
+                        if row.get('domain'):
+                            loaded.append(Detection(
+                                domain=row.get('domain', ''),
+                                target=sys.intern(row.get('target', '')),
+                                fuzzer_type=sys.intern(row.get('fuzzer_type', '')),
+                                risk_score=int(row.get('risk_score', 0)),
+                                risk_factors=_load_factors(row.get('risk_factors', '')),
+                                detection_time=row.get('timestamp', ''),
+                                certificate_issuer=row.get('issuer', '')
+                            ))
+
+            # Bulk stats update: one Counter pass per breakdown instead
+            # of a record_detection call per historical row
+            stats = self.stats
+            stats.detections_count += len(loaded)
+            stats.high_risk_count += sum(1 for d in loaded if d.risk_score >= 70)
+            stats.by_target.update(d.target for d in loaded)
+            stats.by_fuzzer.update(d.fuzzer_type for d in loaded)
+
+            # Sort once here; live appends use datetime.now().isoformat()
+            # timestamps, so the deque stays ordered from then on
+            loaded.sort(key=lambda d: d.detection_time)
+            self.detections.extend(loaded)
         except Exception as e:
             print(f"Error loading detections: {e}")
     
@@ -82,15 +246,33 @@ class WatchtowerService:
         
         self.is_running = True
         self.stats.start_time = datetime.now()
-        
+
+        # Analysis pool for multi-SAN certificates; the automaton and
+        # regex scans release the GIL, so a few threads genuinely overlap
+        if self._pool is None:
+            self._pool = concurrent.futures.ThreadPoolExecutor(max_workers=4)
+
+        if self._writer_thread is None or not self._writer_thread.is_alive():
+            self._writer_thread = threading.Thread(target=self._csv_writer_loop,
+                                                   daemon=True)
+            self._writer_thread.start()
+
         self._thread = threading.Thread(target=self._run_monitor, daemon=True)
         self._thread.start()
-        
+
         return {"status": "started"}
-    
+
     def stop(self):
         """Stop the monitoring service."""
         self.is_running = False
+
+        # Drain queued rows and flush before reporting stopped; the file
+        # handle stays open so the service can be restarted
+        if self._writer_thread is not None and self._writer_thread.is_alive():
+            self._csv_queue.put(None)
+            self._writer_thread.join(timeout=5)
+            self._writer_thread = None
+
         return {"status": "stopped"}
     
     def _run_monitor(self):
@@ -98,8 +280,26 @@ class WatchtowerService:
         import certstream
         import random
         import logging
-        
+
         logger = logging.getLogger('WATCHTOWER')
+
+        # certstream parses every websocket frame with stdlib json in its
+        # receive loop, which dominates CPU at CT feed volume. Swap its
+        # module-level json for an orjson-backed shim when available.
+        try:
+            import orjson
+            from certstream import core as certstream_core
+
+            class _OrjsonShim:
+                loads = staticmethod(orjson.loads)
+
+                @staticmethod
+                def dumps(obj, **kwargs):
+                    return orjson.dumps(obj).decode()
+
+            certstream_core.json = _OrjsonShim
+        except ImportError:
+            pass
         
         # Simulated phishing domains for demo/testing
         DEMO_DOMAINS = [
@@ -150,7 +350,7 @@ class WatchtowerService:
                         logger.info(f"[DEMO] Detection: {demo_domain}")
                 
                 # Emit stats update
-                self.socketio.emit('stats_update', self.stats.to_dict())
+                self._emit_stats_update()
                 time.sleep(2)
         
         # Try real certstream first
@@ -176,57 +376,94 @@ class WatchtowerService:
         """Handle incoming certificate events."""
         if not self.is_running:
             return
-        
-        if message.get('message_type') == 'heartbeat':
-            return
-        
+
+        # One message_type read covers both the heartbeat and
+        # non-certificate cases; this runs for every stream message
         if message.get('message_type') != 'certificate_update':
             return
-        
+
         self.stats.record_cert()
-        
+
         try:
             cert_data = message.get('data', {})
             leaf_cert = cert_data.get('leaf_cert', {})
             all_domains = leaf_cert.get('all_domains', [])
-            
-            for domain in all_domains:
-                self.stats.record_domain()
-                
-                # Skip wildcards
-                if domain.startswith('*.'):
-                    domain = domain[2:]
-                
-                # Analyze domain
-                detection = self._analyze_domain(domain, cert_data)
-                
+
+            self.stats.record_domains(len(all_domains))
+
+            # Strip wildcards
+            all_domains = [d[2:] if d[:2] == '*.' else d for d in all_domains]
+
+            # Per-certificate values, computed once instead of per SAN
+            now_iso = datetime.now().isoformat()
+            try:
+                issuer = leaf_cert.get('issuer', {}).get('O', '')
+            except AttributeError:
+                issuer = ""
+
+            # _analyze_domain is side-effect-free, so multi-SAN certs can
+            # fan the per-domain analysis across the pool; CDN certs carry
+            # dozens of SANs and the C-level scans overlap
+            if self._pool is not None and len(all_domains) > 1:
+                results = self._pool.map(
+                    partial(self._analyze_domain, cert_data=cert_data,
+                            now_iso=now_iso, issuer=issuer),
+                    all_domains)
+            else:
+                results = (self._analyze_domain(d, cert_data, now_iso, issuer)
+                           for d in all_domains)
+
+            # Bind the per-detection calls once; detections are rare but
+            # the loop itself runs for every SAN of every certificate
+            lock = self._lock
+            append = self.detections.append
+            record = self.stats.record_detection
+            for detection in results:
                 if detection:
-                    with self._lock:
-                        self.detections.append(detection)
-                        self.stats.record_detection(detection)
-                    
+                    with lock:
+                        append(detection)
+                        record(detection)
+
                     self._save_detection(detection)
-                    
+
                     # Emit to all connected clients
                     self.socketio.emit('new_detection', detection.to_dict())
             
             # Emit stats update every 100 certs
             if self.stats.certs_processed % 100 == 0:
-                self.socketio.emit('stats_update', self.stats.to_dict())
+                self._emit_stats_update()
                 
         except Exception as e:
             print(f"Error processing cert: {e}")
     
+    def _emit_stats_update(self):
+        """Emit only the stats keys that changed since the last emit.
+
+        Clients merge the partial dict over their previous snapshot, so
+        a quiet interval skips re-serializing and re-broadcasting the
+        full by_target/by_fuzzer breakdowns to every connected client.
+        """
+        snapshot = self.stats.to_dict()
+        last = self._last_emitted_stats
+        delta = {k: v for k, v in snapshot.items() if last.get(k) != v}
+        self._last_emitted_stats = snapshot
+        if delta:
+            self.socketio.emit('stats_update', delta)
+
     def _is_whitelisted(self, domain: str) -> bool:
         """Check if domain is whitelisted."""
         domain_lower = domain.lower()
-        for safe in self.config.whitelist:
-            if domain_lower == safe or domain_lower.endswith('.' + safe):
-                return True
-        return False
+        return domain_lower in self._wl_set or domain_lower.endswith(self._wl_suffixes)
     
-    def _analyze_domain(self, domain: str, cert_data: dict) -> Optional[Detection]:
-        """Analyze a domain for phishing indicators."""
+    def _analyze_domain(self, domain: str, cert_data: dict,
+                        now_iso: Optional[str] = None,
+                        issuer: Optional[str] = None) -> Optional[Detection]:
+        """Analyze a domain for phishing indicators.
+
+        now_iso and issuer are per-certificate values; _on_cert_event
+        computes them once and passes them in so a many-SAN cert does
+        not repeat the datetime formatting and issuer dict walk per SAN.
+        """
         if self._is_whitelisted(domain):
             return None
         
@@ -234,6 +471,21 @@ class WatchtowerService:
         target = self.db.contains_target_keyword(domain)
         fuzzer_type = "keyword-match"
         
+        if not target and HAS_RAPIDFUZZ:
+            # Fuzzy prefilter: Damerau-Levenshtein against the ~30 bare
+            # targets catches close variants (including edits no fuzzer
+            # enumerates) in one C call, before touching the permutation
+            # database at all
+            parts = domain.lower().split('.')
+            label = parts[-2] if len(parts) >= 2 else parts[0]
+            match = rf_process.extractOne(
+                label, self._target_list,
+                scorer=DamerauLevenshtein.normalized_similarity,
+                score_cutoff=0.82
+            )
+            if match:
+                target, fuzzer_type = match[0], 'fuzzy-match'
+
         if not target:
             # Check fuzzer database
             result = self.db.lookup(domain)
@@ -247,88 +499,101 @@ class WatchtowerService:
             factors.insert(0, f"Contains target keyword: {target}")
             score = min(score + 20, 100)
         
-        # Extract certificate info
-        issuer = ""
-        try:
-            issuer = cert_data.get('leaf_cert', {}).get('issuer', {}).get('O', '')
-        except:
-            pass
-        
+        # Extract certificate info (when not already hoisted by the caller)
+        if issuer is None:
+            try:
+                issuer = cert_data.get('leaf_cert', {}).get('issuer', {}).get('O', '')
+            except:
+                issuer = ""
+
+        # Both values come from closed vocabularies repeated across every
+        # Detection; interning shares one str object per name and makes
+        # the stats Counter keying a pointer compare
+        target = sys.intern(target)
+        fuzzer_type = sys.intern(fuzzer_type)
+
         return Detection(
             domain=domain,
             target=target,
             fuzzer_type=fuzzer_type,
             risk_score=score,
             risk_factors=factors,
-            detection_time=datetime.now().isoformat(),
+            detection_time=now_iso if now_iso is not None else datetime.now().isoformat(),
             certificate_issuer=issuer,
             all_domains=cert_data.get('leaf_cert', {}).get('all_domains', [])
         )
     
     def _calculate_risk(self, domain: str, target: str, fuzzer_type: str):
         """Calculate risk score and factors."""
-        score = 0
-        factors = []
         domain_lower = domain.lower()
-        
-        # Base score from detection type
-        if fuzzer_type in ['homoglyph', 'bitsquatting']:
-            score += 40
-            factors.append(f"High-risk fuzzer: {fuzzer_type}")
-        elif fuzzer_type in ['addition', 'hyphenation']:
-            score += 30
-            factors.append(f"Medium-risk fuzzer: {fuzzer_type}")
-        else:
-            score += 25
-            factors.append(f"Typosquatting: {fuzzer_type}")
-        
-        # TLD analysis
-        for tld in self.config.suspicious_tlds:
-            if domain_lower.endswith(tld):
-                score += 25
-                factors.append(f"Suspicious TLD: {tld}")
-                break
-        
-        # Multiple hyphens
-        if domain_lower.count('-') >= 2:
-            score += 15
-            factors.append("Multiple hyphens in domain")
-        
-        # Long domain
-        if len(domain_lower) > 30:
-            score += 10
-            factors.append("Unusually long domain")
-        
-        # Security keywords
-        security_words = ['secure', 'verify', 'login', 'update', 'confirm', 'auth']
-        for word in security_words:
-            if word in domain_lower:
-                score += 15
-                factors.append(f"Security keyword: {word}")
-                break
-        
-        return min(score, 100), factors
+
+        # Extract the features the score depends on...
+        m = self._tld_re.search(domain_lower)
+        sus_tld = m.group(0) if m else None
+
+        m = self._secword_re.search(domain_lower)
+        sec_word = m.group(0) if m else None
+
+        # ...then score via the memoized pure function
+        score, factors = _score_features(
+            fuzzer_type,
+            sus_tld,
+            domain_lower.count('-') >= 2,
+            len(domain_lower) > 30,
+            sec_word,
+        )
+        return score, list(factors)
     
     def _save_detection(self, detection: Detection):
-        """Save detection to CSV file."""
-        try:
-            file_exists = os.path.exists(self.output_file)
-            with open(self.output_file, 'a', newline='', encoding='utf-8') as f:
-                writer = csv.writer(f)
-                if not file_exists:
-                    writer.writerow(['timestamp', 'domain', 'target', 'fuzzer_type', 
-                                   'risk_score', 'risk_factors', 'issuer'])
-                writer.writerow([
-                    detection.detection_time,
-                    detection.domain,
-                    detection.target,
-                    detection.fuzzer_type,
-                    detection.risk_score,
-                    '; '.join(detection.risk_factors),
-                    detection.certificate_issuer
-                ])
-        except Exception as e:
-            print(f"Error saving detection: {e}")
+        """Queue a detection row for the background CSV writer."""
+        self._csv_queue.put((
+            detection.detection_time,
+            detection.domain,
+            detection.target,
+            detection.fuzzer_type,
+            detection.risk_score,
+            _dump_factors(detection.risk_factors),
+            detection.certificate_issuer
+        ))
+
+    def _csv_writer_loop(self):
+        """Drain queued detection rows in batches (background thread).
+
+        Rows are written up to 64 at a time with writerows and the file
+        is flushed at most twice a second, so detection bursts cost one
+        buffered write instead of an open/append/close per row. Exits on
+        the None sentinel posted by stop(), flushing what remains.
+        """
+        q = self._csv_queue
+        last_flush = time.monotonic()
+        running = True
+        while running:
+            row = q.get()
+            rows = []
+            if row is None:
+                running = False
+            else:
+                rows.append(row)
+                try:
+                    while len(rows) < 64:
+                        nxt = q.get_nowait()
+                        if nxt is None:
+                            running = False
+                            break
+                        rows.append(nxt)
+                except queue.Empty:
+                    pass
+
+            if rows:
+                try:
+                    self._csv_writer.writerows(rows)
+                except Exception as e:
+                    print(f"Error saving detection: {e}")
+
+            now = time.monotonic()
+            if not running or now - last_flush >= 0.5:
+                self._csv_fh.flush()
+                last_flush = now
     
     def get_status(self) -> dict:
         """Get current status."""
@@ -340,60 +605,122 @@ class WatchtowerService:
         }
     
     def get_detections(self, limit: int = 100, offset: int = 0) -> List[dict]:
-        """Get paginated detections."""
+        """Get paginated detections, newest first.
+
+        The deque is already time-ordered (sorted once at CSV load,
+        appended monotonically afterwards), so pagination is a reversed
+        walk instead of an O(N log N) sort per dashboard poll.
+        """
         with self._lock:
-            sorted_detections = sorted(
-                self.detections, 
-                key=lambda d: d.detection_time, 
-                reverse=True
-            )
-            return [d.to_dict() for d in sorted_detections[offset:offset+limit]]
+            return [d.to_dict() for d in
+                    islice(reversed(self.detections), offset, offset + limit)]
     
     def get_stats(self) -> dict:
         """Get aggregated statistics."""
         return self.stats.to_dict()
 
 
+# Closed vocabulary of fuzzer names the service can emit: DomainFuzzer's
+# generators plus the two detection paths added in _analyze_domain
+_FUZZER_TYPES = (
+    'addition', 'bitsquatting', 'homoglyph', 'hyphenation', 'insertion',
+    'omission', 'repetition', 'replacement', 'transposition', 'vowel-swap',
+    'keyword-match', 'fuzzy-match',
+)
+
+
 class WatchtowerStats:
     """Statistics tracker for Watchtower."""
-    
-    def __init__(self):
+
+    def __init__(self, targets: Optional[List[str]] = None):
         self.start_time = datetime.now()
+        # Recording methods increment without taking a lock: the event
+        # callback is single-threaded and an int += 1 / Counter[key] += 1
+        # never tears under the GIL. The lock is only held in to_dict()
+        # so periodic readers see a consistent snapshot.
         self.certs_processed = 0
         self.domains_checked = 0
         self.detections_count = 0
         self.high_risk_count = 0
-        self.by_target: Dict[str, int] = defaultdict(int)
-        self.by_fuzzer: Dict[str, int] = defaultdict(int)
+        # Targets and fuzzer names are known up front, so the hot
+        # breakdowns are flat int64 arrays indexed by a name->slot dict;
+        # record_detection becomes one dict probe and one array bump.
+        # The Counters stay as the overflow path (unknown names, or
+        # numpy absent / no target list given).
+        self.by_target: Counter = Counter()
+        self.by_fuzzer: Counter = Counter()
+        if HAS_NUMPY and targets is not None:
+            self._target_idx = {t: i for i, t in enumerate(targets)}
+            self._fuzzer_idx = {f: i for i, f in enumerate(_FUZZER_TYPES)}
+            self._target_counts = np.zeros(len(self._target_idx), dtype=np.int64)
+            self._fuzzer_counts = np.zeros(len(_FUZZER_TYPES), dtype=np.int64)
+        else:
+            self._target_idx = None
+            self._fuzzer_idx = None
         self._lock = threading.Lock()
-    
+
     def record_cert(self):
-        with self._lock:
-            self.certs_processed += 1
-    
+        self.certs_processed += 1
+
     def record_domain(self):
-        with self._lock:
-            self.domains_checked += 1
-    
+        self.domains_checked += 1
+
+    def record_domains(self, n: int):
+        """Record a whole certificate's SANs in one bump."""
+        self.domains_checked += n
+
     def record_detection(self, detection: Detection):
-        with self._lock:
-            self.detections_count += 1
-            if detection.risk_score >= 70:
-                self.high_risk_count += 1
+        self.detections_count += 1
+        if detection.risk_score >= 70:
+            self.high_risk_count += 1
+        if self._target_idx is not None:
+            i = self._target_idx.get(detection.target)
+            if i is not None:
+                self._target_counts[i] += 1
+            else:
+                self.by_target[detection.target] += 1
+            i = self._fuzzer_idx.get(detection.fuzzer_type)
+            if i is not None:
+                self._fuzzer_counts[i] += 1
+            else:
+                self.by_fuzzer[detection.fuzzer_type] += 1
+        else:
             self.by_target[detection.target] += 1
             self.by_fuzzer[detection.fuzzer_type] += 1
-    
+
+    def _breakdown(self, idx: Optional[dict], counts, overflow: Counter) -> dict:
+        """Merge an array breakdown with its overflow Counter."""
+        merged = Counter(overflow)
+        if idx is not None:
+            for name, i in idx.items():
+                n = int(counts[i])
+                if n:
+                    merged[name] += n
+        return dict(merged)
+
     def to_dict(self) -> dict:
+        with self._lock:
+            certs_processed = self.certs_processed
+            domains_checked = self.domains_checked
+            detections_count = self.detections_count
+            high_risk_count = self.high_risk_count
+            by_target = self._breakdown(self._target_idx, self._target_counts
+                                        if self._target_idx is not None else None,
+                                        self.by_target)
+            by_fuzzer = self._breakdown(self._fuzzer_idx, self._fuzzer_counts
+                                        if self._fuzzer_idx is not None else None,
+                                        self.by_fuzzer)
+
         runtime = (datetime.now() - self.start_time).total_seconds()
         return {
             "runtime_seconds": runtime,
-            "certs_processed": self.certs_processed,
-            "domains_checked": self.domains_checked,
-            "detections_count": self.detections_count,
-            "high_risk_count": self.high_risk_count,
-            "processing_rate": self.certs_processed / max(runtime, 1),
-            "by_target": dict(self.by_target),
-            "by_fuzzer": dict(self.by_fuzzer)
+            "certs_processed": certs_processed,
+            "domains_checked": domains_checked,
+            "detections_count": detections_count,
+            "high_risk_count": high_risk_count,
+            "processing_rate": certs_processed / max(runtime, 1),
+            "by_target": by_target,
+            "by_fuzzer": by_fuzzer
         }
 
 
@@ -0,0 +1,101 @@
+# cython: language_level=3
+# cython: boundscheck=False, wraparound=False
+"""
+Cython-compiled fuzzer kernels for watchtower's DomainFuzzer.
+
+Optional speed rung: build in place with
+
+    python setup.py build_ext --inplace
+
+and watchtower.py routes its single-edit generators here, turning the
+CPython bytecode loops into C loops over unsigned char buffers. Inputs
+are the ASCII byte form of the target domain; outputs are lists of
+candidate strings identical to what the pure-Python generators yield.
+"""
+
+
+cdef inline bint _valid_byte(unsigned char b):
+    # a-z, 0-9, '-'
+    return (97 <= b <= 122) or (48 <= b <= 57) or b == 45
+
+
+cpdef list bitsquatting(bytes domain):
+    """Single bit flips that stay within valid domain bytes."""
+    cdef const unsigned char* s = domain
+    cdef Py_ssize_t n = len(domain)
+    cdef Py_ssize_t i
+    cdef int m
+    cdef unsigned char orig, flipped
+    cdef bytearray buf = bytearray(domain)
+    cdef list out = []
+    for i in range(n):
+        orig = s[i]
+        for m in range(8):
+            flipped = orig ^ (<unsigned char>(1 << m))
+            if _valid_byte(flipped):
+                buf[i] = flipped
+                out.append(buf.decode('ascii'))
+        buf[i] = orig
+    return out
+
+
+cpdef list replacement(bytes domain, tuple adjacency):
+    """Adjacent-key replacements.
+
+    ``adjacency`` is a 256-entry tuple mapping each byte value to a bytes
+    object of its neighbouring keys (empty for bytes with no neighbours).
+    """
+    cdef const unsigned char* s = domain
+    cdef Py_ssize_t n = len(domain)
+    cdef Py_ssize_t i, j, m
+    cdef unsigned char orig
+    cdef bytes adj
+    cdef bytearray buf = bytearray(domain)
+    cdef list out = []
+    for i in range(n):
+        orig = s[i]
+        adj = <bytes>adjacency[orig]
+        m = len(adj)
+        for j in range(m):
+            buf[i] = (<const unsigned char*>adj)[j]
+            out.append(buf.decode('ascii'))
+        buf[i] = orig
+    return out
+
+
+cpdef list transposition(bytes domain):
+    """Swaps of each adjacent character pair."""
+    cdef const unsigned char* s = domain
+    cdef Py_ssize_t n = len(domain)
+    cdef Py_ssize_t i
+    cdef bytearray buf = bytearray(domain)
+    cdef list out = []
+    for i in range(n - 1):
+        buf[i] = s[i + 1]
+        buf[i + 1] = s[i]
+        out.append(buf.decode('ascii'))
+        buf[i] = s[i]
+        buf[i + 1] = s[i + 1]
+    return out
+
+
+cpdef list vowel_swap(bytes domain):
+    """Each vowel replaced by every other vowel."""
+    cdef const unsigned char* s = domain
+    cdef Py_ssize_t n = len(domain)
+    cdef Py_ssize_t i, j
+    cdef unsigned char orig, v
+    cdef bytes vowels = b'aeiou'
+    cdef const unsigned char* vp = vowels
+    cdef bytearray buf = bytearray(domain)
+    cdef list out = []
+    for i in range(n):
+        orig = s[i]
+        if orig == 97 or orig == 101 or orig == 105 or orig == 111 or orig == 117:
+            for j in range(5):
+                v = vp[j]
+                if v != orig:
+                    buf[i] = v
+                    out.append(buf.decode('ascii'))
+            buf[i] = orig
+    return out